@@ -1,13 +1,14 @@
 import serial
 import time
-import binascii
 import struct
 import datetime
+import functools
 import json
 import paho.mqtt.client as mqtt
 import argparse
 import sys
 import os
+import signal
 from dotenv import load_dotenv
 
 # Lade Umgebungsvariablen aus .env Datei
@@ -24,10 +25,28 @@ TIMEOUT = float(os.getenv('TIMEOUT', '0.1'))  # Sekunden
 # Modbus RTU Frame Mindestlänge: Adresse(1) + Funktion(1) + Daten(>=2) + CRC(2)
 MIN_FRAME_SIZE = 6
 MAX_FRAME_SIZE = 256  # Maximale Größe eines Modbus RTU Frames
+# Untergrenze für das Lese-Timeout im Leerlauf: bei TIMEOUT=0 würde read() sofort zurückkehren
+# und die Hauptschleife mit voller CPU-Last drehen
+MIN_READ_TIMEOUT = 0.01  # Sekunden
+
+
+def modbus_frame_gap(baudrate):
+    """
+    Berechnet die Modbus RTU Frame-Pause (3,5 Zeichenzeiten) in Sekunden.
+    Ab 19200 Baud schreibt die Spezifikation feste 1,75 ms vor.
+    """
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * 11 / baudrate  # 11 Bit pro Zeichen (Start, 8 Daten, Parität/Stopp, Stopp)
 
 # MQTT Konfiguration
 MQTT_PUBLISH_INTERVAL = int(os.getenv('MQTT_PUBLISH_INTERVAL', '10'))  # Sekunden zwischen MQTT-Veröffentlichungen
 mqtt_last_publish_time = 0  # Zeitstempel der letzten Veröffentlichung
+mqtt_client = None  # Persistenter MQTT-Client, siehe get_mqtt_client()
+
+# Wiederverwendeter JSON-Encoder mit kompakten Trennzeichen (kein Encoder-Aufbau pro Nachricht);
+# Payload und Messwert-Dict werden pro Veröffentlichung neu gebaut, Zirkelbezüge sind ausgeschlossen
+JSON_ENCODER = json.JSONEncoder(separators=(',', ':'), check_circular=False)
 
 # Debug-Ausgabe Funktion
 def debug_print(*args, **kwargs):
@@ -78,27 +97,98 @@ REGISTER_MAP = {
     
 }
 
+# Vorkompilierte struct-Formate für zwei 16-bit Register und Big-Endian Float32
+WORDS_BE = struct.Struct('>HH')
+FLOAT32_BE = struct.Struct('>f')
+
+
+@functools.lru_cache(maxsize=None)
+def registers_struct(count):
+    """Liefert das (einmalig erzeugte) struct-Format für count 16-bit Register (Big-Endian)."""
+    return struct.Struct(f'>{count}H')
 
-def is_valid_crc(frame):
-    if len(frame) < MIN_FRAME_SIZE:
-        return False
-    data = frame[:-2]
-    crc_received = frame[-2:]
-    crc_calc = crc16(data)
-    return crc_received == crc_calc
 
+@functools.lru_cache(maxsize=None)
+def floats_struct(count):
+    """Liefert das (einmalig erzeugte) struct-Format für count Float32-Werte (Big-Endian)."""
+    return struct.Struct(f'>{count}f')
 
-def crc16(data: bytes):
-    '''Berechnet Modbus CRC16'''
+
+# Plausibilitätsgrenzen (min, max) je Messgröße, geprüft nach Anwendung des Faktors
+PLAUSIBILITY_LIMITS = {
+    "Spannung": (10, 500),
+    "Strom": (0, 100),
+    "Frequenz": (45, 65),
+}
+
+# Vorberechnete Dekodier-Tabelle der Float32-Register: Adresse -> (Name, Einheit, Faktor, Grenzen)
+FLOAT32_REGISTERS = {
+    addr: (
+        info["name"],
+        info["unit"],
+        info["factor"],
+        next((limits for key, limits in PLAUSIBILITY_LIMITS.items() if key in info["name"]), None),
+    )
+    for addr, info in REGISTER_MAP.items()
+    if info["format"] == "float32"
+}
+
+
+def _crc16_byte(value):
+    '''Berechnet den CRC16-Tabelleneintrag für ein einzelnes Byte (Polynom 0xA001)'''
+    crc = value
+    for _ in range(8):
+        if crc & 1:
+            crc = (crc >> 1) ^ 0xA001
+        else:
+            crc >>= 1
+    return crc
+
+
+# Vorberechnete CRC16-Tabelle (Sarwate): ein Tabellenzugriff pro Byte statt 8 Bit-Schritten
+CRC16_TABLE = tuple(_crc16_byte(i) for i in range(256))
+
+
+def find_crc_frame_length(buffer, start):
+    """
+    Sucht ab Position start die kürzeste Framelänge mit gültiger CRC.
+
+    Der CRC wird dabei inkrementell fortgeschrieben, statt ihn für jede
+    mögliche Framelänge über den gesamten Frame neu zu berechnen.
+
+    Returns:
+        Länge des gültigen Frames oder 0, falls keiner gefunden wurde
+    """
+    end = start + min(MAX_FRAME_SIZE, len(buffer) - start + 1) - 1
+    table = CRC16_TABLE
     crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc = (crc >> 1) ^ 0xA001
-            else:
-                crc >>= 1
-    return crc.to_bytes(2, 'little')
+    # Nutzdaten des kürzestmöglichen Frames vorab einrechnen
+    for b in buffer[start:start + MIN_FRAME_SIZE - 3]:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    pos = start + MIN_FRAME_SIZE - 3
+    while pos + 2 < end:
+        crc = (crc >> 8) ^ table[(crc ^ buffer[pos]) & 0xFF]
+        pos += 1
+        if buffer[pos] == (crc & 0xFF) and buffer[pos + 1] == (crc >> 8):
+            return pos + 2 - start
+    return 0
+
+
+def find_valid_frame(buffer, start=0):
+    """
+    Sucht ab Position start den ersten Frame mit gültiger CRC im Buffer.
+
+    Returns:
+        Tuple (frame_start, frame_size); (-1, 0), wenn kein Frame gefunden wurde
+    """
+    last_start = len(buffer) - MIN_FRAME_SIZE
+    frame_start = start
+    while frame_start <= last_start:
+        frame_size = find_crc_frame_length(buffer, frame_start)
+        if frame_size:
+            return frame_start, frame_size
+        frame_start += 1
+    return -1, 0
 
 
 def decode_modbus_frame(frame):
@@ -113,7 +203,7 @@ def decode_modbus_frame(frame):
         'slave_addr': slave_addr,
         'function_code': function_code,
         'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
-        'raw': binascii.hexlify(frame).decode()
+        'raw': frame.hex()
     }
     
     # Funktion 3: Read Holding Registers
@@ -138,14 +228,8 @@ def decode_modbus_frame(frame):
         if len(frame) < 3 + data_len:
             return result
         
-        data = frame[3:3+data_len]
-        registers = []
-        
-        # Daten in 16-bit Register umwandeln
-        for i in range(0, len(data), 2):
-            if i+1 < len(data):
-                register_value = (data[i] << 8) + data[i+1]
-                registers.append(register_value)
+        # Daten in 16-bit Register umwandeln (ein struct-Aufruf für alle Register)
+        registers = list(registers_struct(data_len // 2).unpack_from(frame, 3))
         
         result['request_type'] = 'response'
         result['data_len'] = data_len
@@ -284,16 +368,7 @@ def interpret_float32(high_word, low_word):
     Interpretiert zwei 16-bit Register als Float32 (IEEE 754) Wert.
     CHINT G DTSU666 verwendet die Reihenfolge High-Low für 32-bit Werte.
     """
-    try:
-        value_bytes = high_word.to_bytes(2, 'big') + low_word.to_bytes(2, 'big')
-        return struct.unpack('>f', value_bytes)[0]
-    except Exception:
-        # Alternative Byte-Reihenfolge probieren (für verschiedene Modbus-Implementierungen)
-        try:
-            value_bytes = high_word.to_bytes(2, 'little') + low_word.to_bytes(2, 'little')
-            return struct.unpack('<f', value_bytes)[0]
-        except Exception:
-            return 0.0
+    return FLOAT32_BE.unpack(WORDS_BE.pack(high_word, low_word))[0]
 
 
 def decode_smart_meter_registers(registers, request_addr=None):
@@ -347,36 +422,29 @@ def try_decode_with_addr(registers, request_addr):
     """
     decoded = {}
     
+    # Alle Registerpaare in einem Schritt als Float32 (High-Low) dekodieren
+    float_count = len(registers) // 2
+    floats = floats_struct(float_count).unpack(registers_struct(float_count * 2).pack(*registers[:float_count * 2]))
+    
     # Interpretiere die Register als 32-bit Werte (jeweils 2 Register)
     for i in range(0, len(registers) - 1, 2):
-        reg_addr = request_addr + i
-        if reg_addr in REGISTER_MAP:
-            reg_info = REGISTER_MAP[reg_addr]
-            high_word = registers[i]
-            low_word = registers[i + 1]
-            
-            if reg_info["format"] == "float32":
-                try:
-                    value = interpret_float32(high_word, low_word)
-                    # Anwendung des Faktors für korrekte Einheit
-                    value = value * reg_info["factor"]
-                    
-                    # Plausibilitätsprüfung für einige bekannte Werte
-                    if "Spannung" in reg_info["name"] and (value < 10 or value > 500):
-                        continue  # Unplausible Spannung
-                    if "Strom" in reg_info["name"] and (value < 0 or value > 100):
-                        continue  # Unplausible Stromstärke
-                    if "Frequenz" in reg_info["name"] and (value < 45 or value > 65):
-                        continue  # Unplausible Frequenz
-                    
-                    decoded[reg_info["name"]] = {
-                        "value": value,
-                        "unit": reg_info["unit"],
-                        "raw": f"0x{high_word:04X}{low_word:04X}"
-                    }
-                except Exception:
-                    # Fehlgeschlagene Float-Interpretation überspringen
-                    continue
+        entry = FLOAT32_REGISTERS.get(request_addr + i)
+        if entry is None:
+            continue
+        name, unit, factor, limits = entry
+        
+        # Anwendung des Faktors für korrekte Einheit
+        value = floats[i // 2] * factor
+        
+        # Plausibilitätsprüfung für bekannte Messgrößen (Spannung, Strom, Frequenz)
+        if limits is not None and (value < limits[0] or value > limits[1]):
+            continue
+        
+        decoded[name] = {
+            "value": value,
+            "unit": unit,
+            "raw": f"0x{registers[i]:04X}{registers[i + 1]:04X}"
+        }
     
     return decoded
 
@@ -422,6 +490,35 @@ def export_to_csv(frame_info, filename="smart_meter_data.csv"):
         writer.writerow(row_data)
 
 
+def get_mqtt_client(mqtt_config):
+    """
+    Liefert den persistenten MQTT-Client und verbindet ihn beim ersten Aufruf.
+    Der Netzwerkverkehr läuft in einem Hintergrund-Thread (loop_start), damit
+    publish() die Empfangsschleife nicht blockiert.
+    """
+    global mqtt_client
+    
+    if mqtt_client is None:
+        # Verwende MQTT-Client mit API v2 (protocol=mqtt.MQTTv5)
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+        if mqtt_config.get('username') and mqtt_config.get('password'):
+            client.username_pw_set(mqtt_config['username'], mqtt_config['password'])
+        client.connect(mqtt_config['broker'], mqtt_config.get('port', 1883), 60)
+        client.loop_start()
+        mqtt_client = client
+    return mqtt_client
+
+
+def close_mqtt_client():
+    """Stoppt den MQTT-Hintergrund-Thread und trennt die Verbindung"""
+    global mqtt_client
+    
+    if mqtt_client is not None:
+        mqtt_client.loop_stop()
+        mqtt_client.disconnect()
+        mqtt_client = None
+
+
 def publish_mqtt(frame_info, mqtt_config):
     """
     Sendet die dekodierten Smart Meter Werte per MQTT als JSON.
@@ -438,18 +535,13 @@ def publish_mqtt(frame_info, mqtt_config):
     if current_time - mqtt_last_publish_time < MQTT_PUBLISH_INTERVAL:
         return  # Noch nicht bereit zur Veröffentlichung
     
-    # Verwende MQTT-Client mit API v2 (protocol=mqtt.MQTTv5)
-    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
-    if mqtt_config.get('username') and mqtt_config.get('password'):
-        client.username_pw_set(mqtt_config['username'], mqtt_config['password'])
     try:
-        client.connect(mqtt_config['broker'], mqtt_config.get('port', 1883), 60)
+        client = get_mqtt_client(mqtt_config)
         payload = {
             'timestamp': frame_info['timestamp'],
             'values': frame_info['smart_meter_values']
         }
-        client.publish(mqtt_config['topic'], json.dumps(payload), qos=1)
-        client.disconnect()
+        client.publish(mqtt_config['topic'], JSON_ENCODER.encode(payload), qos=1)
         log_print(f"MQTT: Daten an Topic '{mqtt_config['topic']}' gesendet (Intervall: {MQTT_PUBLISH_INTERVAL}s).")
         
         # Zeitstempel der letzten Veröffentlichung aktualisieren
@@ -496,6 +588,9 @@ def parse_arguments():
     return parser.parse_args()
 
 def main():
+    # SIGTERM (z.B. docker stop) wie ein normales Programmende behandeln, damit finally aufräumt
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     try:
         global DEBUG_MODE, SERIAL_PORT, BAUDRATE, MQTT_PUBLISH_INTERVAL, TIMEOUT
         global last_request_start_addr, last_request_registers, mqtt_last_publish_time
@@ -533,77 +628,83 @@ def main():
         mqtt_last_publish_time = 0  # Zeitstempel der letzten MQTT-Veröffentlichung zurücksetzen
         
         # Serielle Verbindung öffnen
-        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=TIMEOUT)
+        # Die RTU-Frame-Pause wird selbst gemessen: inter_byte_timeout wirkt unter POSIX nur in
+        # Zehntelsekunden (VTIME) und kann die Pause von wenigen Millisekunden nicht abbilden
+        frame_gap = modbus_frame_gap(BAUDRATE)
+        idle_timeout = max(TIMEOUT, MIN_READ_TIMEOUT)
+        ser = serial.Serial(SERIAL_PORT, BAUDRATE, timeout=idle_timeout)
         log_print(f'Sniffe Modbus RTU auf {SERIAL_PORT} mit {BAUDRATE} Baud (Timeout: {TIMEOUT}s)...')
         log_print(f'Drücke STRG+C zum Beenden')
         log_print(f'MQTT Veröffentlichungsintervall: {MQTT_PUBLISH_INTERVAL} Sekunden')
         if DEBUG_MODE:
             log_print(f'Debug-Modus aktiviert: Ausführliche Ausgaben werden angezeigt')
         
-        buffer = b''
-        last_data_time = time.time()
+        buffer = bytearray()
+        last_data_time = time.monotonic()
+        pending = False  # Neue Bytes seit der letzten Pufferprüfung
         
         while True:
-            # Daten lesen
-            data = ser.read(256)
-            current_time = time.time()
+            # Mit neuen Bytes im Puffer höchstens eine Frame-Pause auf weitere Daten warten,
+            # im Leerlauf bis idle_timeout (Timeout nur beim Wechsel umstellen)
+            read_timeout = frame_gap if pending else idle_timeout
+            if ser.timeout != read_timeout:
+                ser.timeout = read_timeout
+            # Bereits empfangene Bytes sofort abholen, sonst auf das nächste Byte warten
+            data = ser.read(ser.in_waiting or 1)
+            current_time = time.monotonic()
             
             if data:
-                buffer += data
+                buffer.extend(data)
                 last_data_time = current_time
+                pending = True
                 # Aktivitätsindikator nur im Debug-Modus anzeigen
                 if DEBUG_MODE:
                     print(".", end="", flush=True)
             
-            # Wenn genug Zeit ohne neue Daten vergangen ist, pufferinhalt prüfen
-            if len(buffer) > 0 and (current_time - last_data_time) > TIMEOUT:
-                frame_start = 0
-                
-                # Versuche, Frames im Buffer zu finden
-                while frame_start < len(buffer) and len(buffer) - frame_start >= MIN_FRAME_SIZE:
-                    # Versuche verschiedene Framegrößen
-                    valid_frame = None
+            # Nach einer Frame-Pause (3,5 Zeichenzeiten ohne neue Bytes) den Puffer prüfen;
+            # unvollständige Frames bleiben im Puffer, bis ihre CRC passt
+            if pending and (current_time - last_data_time) >= frame_gap:
+                pending = False
+                # Versuche, Frames im Buffer zu finden; verarbeitete Bytes werden erst
+                # nach dem Durchlauf in einem Schritt entfernt
+                read_pos = 0
+                while True:
+                    frame_start, frame_size = find_valid_frame(buffer, read_pos)
+                    if not frame_size:
+                        # Keine gültige CRC mehr im Buffer
+                        break
                     
-                    for frame_size in range(MIN_FRAME_SIZE, min(MAX_FRAME_SIZE, len(buffer) - frame_start + 1)):
-                        possible_frame = buffer[frame_start:frame_start+frame_size]
-                        if is_valid_crc(possible_frame):
-                            valid_frame = possible_frame
-                            break
+                    valid_frame = buffer[frame_start:frame_start+frame_size]
                     
-                    if valid_frame:
-                        # Frame gefunden und dekodieren
-                        frame_info = decode_modbus_frame(valid_frame)
-                        
-                        # Wenn es sich um eine Read Holding Register Anfrage handelt, 
-                        # speichere die Startadresse für die nächste Antwort
-                        if (frame_info['function_code'] == 3 and
-                            'request_type' in frame_info and 
-                            frame_info['request_type'] == 'request'):
-                            last_request_start_addr = frame_info.get('start_addr')
-                            last_request_registers = frame_info.get('reg_count')
-                        
-                        print_frame_info(frame_info)
-                        export_to_csv(frame_info)  # Exportiere die Daten nach CSV
-                        publish_mqtt(frame_info, mqtt_config)  # Sende die Daten per MQTT
-                        
-                        # Buffer nach dem Frame fortsetzen
-                        buffer = buffer[frame_start + len(valid_frame):]
-                        frame_start = 0
-                    else:
-                        # Keine gültige CRC, weiter im Buffer suchen
-                        frame_start += 1
+                    # Frame gefunden und dekodieren
+                    frame_info = decode_modbus_frame(valid_frame)
+                    
+                    # Wenn es sich um eine Read Holding Register Anfrage handelt, 
+                    # speichere die Startadresse für die nächste Antwort
+                    if (frame_info['function_code'] == 3 and
+                        'request_type' in frame_info and 
+                        frame_info['request_type'] == 'request'):
+                        last_request_start_addr = frame_info.get('start_addr')
+                        last_request_registers = frame_info.get('reg_count')
+                    
+                    print_frame_info(frame_info)
+                    export_to_csv(frame_info)  # Exportiere die Daten nach CSV
+                    publish_mqtt(frame_info, mqtt_config)  # Sende die Daten per MQTT
+                    
+                    # Suche nach dem Frame fortsetzen
+                    read_pos = frame_start + frame_size
+                
+                del buffer[:read_pos]
                 
                 # Wenn kein Frame gefunden wurde und der Buffer zu groß wird, älteren Teil verwerfen
                 if len(buffer) > MAX_FRAME_SIZE * 2:
-                    buffer = buffer[-MAX_FRAME_SIZE:]
+                    del buffer[:-MAX_FRAME_SIZE]
             
             # Zeige periodische Aktivitätsnachricht (unabhängig vom Debug-Modus)
             current_minute = int(time.time()) // 60
             if current_minute != getattr(main, 'last_activity_minute', None):
                 main.last_activity_minute = current_minute
                 log_print(f"Modbus Sniffer aktiv: {datetime.datetime.now().strftime('%H:%M:%S')}")
-            
-            time.sleep(0.01)
     
     except KeyboardInterrupt:
         log_print("\nProgram beendet durch Benutzer")
@@ -613,6 +714,7 @@ def main():
         if 'ser' in locals() and ser.is_open:
             ser.close()
             log_print("Serieller Port geschlossen")
+        close_mqtt_client()
 
 
 # Globale Variablen zur Speicherung der letzten Anfrage-Daten